@@ -4,34 +4,86 @@ Real-time metrics for apartment leasing dashboard
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, func, case, cast, true, Integer
 from typing import Dict, List
 from datetime import datetime, timedelta
 from collections import Counter
-from . import models
+from . import models, cache
+
+
+def _status_count(status: models.UnitStatus):
+    """
+    SUM(CASE ...) expression counting units with the given status
+    """
+    return func.sum(case((models.Unit.status == status, 1), else_=0))
+
+
+def _days_to_lease():
+    """
+    Whole days between listing and lease for a unit
+    """
+    return cast(
+        func.julianday(models.Unit.date_leased) - func.julianday(models.Unit.date_listed),
+        Integer
+    )
+
+
+def get_unit_summary(db: Session):
+    """
+    Aggregate unit counts by status plus averages and recent leases in one scan
+    Conditional aggregates (CASE inside SUM/AVG) replace per-metric queries
+
+    Returns:
+        Row with total, available, leased, pending, avg_price, avg_lead_score,
+        avg_days_to_lease, recent_leases_30d
+    """
+    is_leased = models.Unit.status == models.UnitStatus.LEASED
+    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+
+    return db.query(
+        func.count(models.Unit.id).label('total'),
+        _status_count(models.UnitStatus.AVAILABLE).label('available'),
+        _status_count(models.UnitStatus.LEASED).label('leased'),
+        _status_count(models.UnitStatus.PENDING).label('pending'),
+        func.avg(models.Unit.price).label('avg_price'),
+        func.avg(case(
+            (models.Unit.status == models.UnitStatus.AVAILABLE, models.Unit.lead_score)
+        )).label('avg_lead_score'),
+        func.avg(case(
+            (and_(is_leased, models.Unit.date_leased.isnot(None)), _days_to_lease())
+        )).label('avg_days_to_lease'),
+        func.sum(case(
+            (and_(is_leased, models.Unit.date_leased >= thirty_days_ago), 1), else_=0
+        )).label('recent_leases_30d')
+    ).one()
 
 
 def get_dashboard_analytics(db: Session) -> Dict:
+    """
+    Get comprehensive analytics for dashboard display
+    Served from cache until a unit write invalidates it
+
+    Returns:
+        Dictionary containing all key metrics
+    """
+    return cache.cached("dashboard", lambda: _compute_dashboard_analytics(db))
+
+
+def _compute_dashboard_analytics(db: Session) -> Dict:
     """
     Calculate comprehensive analytics for dashboard display
 
     Returns:
         Dictionary containing all key metrics
     """
-    # Get unit counts by status
-    total_units = db.query(models.Unit).count()
-    available_units = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.AVAILABLE
-    ).count()
-    leased_units = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.LEASED
-    ).count()
-    pending_units = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.PENDING
-    ).count()
-
-    # Calculate average days to lease
-    avg_days_to_lease = calculate_average_days_to_lease(db)
+    # Unit counts by status, average price and days to lease (single query)
+    summary = get_unit_summary(db)
+    total_units = summary.total
+    available_units = summary.available or 0
+    leased_units = summary.leased or 0
+    pending_units = summary.pending or 0
+
+    avg_days_to_lease = float(summary.avg_days_to_lease or 0.0)
 
     # Calculate lease conversion rate
     lease_conversion_rate = calculate_conversion_rate(
@@ -39,8 +91,8 @@ def get_dashboard_analytics(db: Session) -> Dict:
         leased_units + available_units
     )
 
-    # Calculate average price
-    avg_price = db.query(func.avg(models.Unit.price)).scalar() or 0
+    # Average price comes from the summary query
+    avg_price = summary.avg_price or 0
 
     # Get most popular features
     popular_features = get_most_popular_features(db)
@@ -68,20 +120,13 @@ def calculate_average_days_to_lease(db: Session) -> float:
     Returns:
         Average days as float
     """
-    leased_units = db.query(models.Unit).filter(
+    # Whole days between listing and lease, averaged by the database
+    avg_days = db.query(func.avg(_days_to_lease())).filter(
         models.Unit.status == models.UnitStatus.LEASED,
         models.Unit.date_leased.isnot(None)
-    ).all()
-
-    if not leased_units:
-        return 0.0
-
-    total_days = 0
-    for unit in leased_units:
-        days = (unit.date_leased - unit.date_listed).days
-        total_days += days
+    ).scalar()
 
-    return total_days / len(leased_units)
+    return float(avg_days or 0.0)
 
 
 def calculate_conversion_rate(leased_count: int, total_count: int) -> float:
@@ -109,24 +154,24 @@ def get_most_popular_features(db: Session, limit: int = 10) -> List[Dict]:
     Returns:
         List of features with popularity metrics
     """
-    leased_units = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.LEASED
-    ).all()
-
-    available_units = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.AVAILABLE
-    ).all()
+    # Unnest the amenities JSON array and count per (amenity, status) in SQL
+    amenity_tv = func.json_each(models.Unit.amenities).table_valued('value')
+    rows = db.query(
+        amenity_tv.c.value,
+        models.Unit.status,
+        func.count().label('count')
+    ).select_from(models.Unit).join(amenity_tv, true()).filter(
+        models.Unit.status.in_([models.UnitStatus.LEASED, models.UnitStatus.AVAILABLE])
+    ).group_by(amenity_tv.c.value, models.Unit.status).all()
 
     # Count amenity frequency
     leased_amenities = Counter()
-    for unit in leased_units:
-        if unit.amenities:
-            leased_amenities.update(unit.amenities)
-
     available_amenities = Counter()
-    for unit in available_units:
-        if unit.amenities:
-            available_amenities.update(unit.amenities)
+    for name, status, count in rows:
+        if status == models.UnitStatus.LEASED:
+            leased_amenities[name] = count
+        else:
+            available_amenities[name] = count
 
     # Calculate popularity ratio
     feature_scores = []
@@ -155,6 +200,21 @@ def get_most_popular_features(db: Session, limit: int = 10) -> List[Dict]:
 
 
 def get_price_trends(db: Session, days: int = 30) -> List[Dict]:
+    """
+    Get average price trends over time
+    Cached per look-back window until a unit write invalidates it
+
+    Args:
+        db: Database session
+        days: Number of days to look back
+
+    Returns:
+        List of daily average prices
+    """
+    return cache.cached(("price_trends", days), lambda: _compute_price_trends(db, days))
+
+
+def _compute_price_trends(db: Session, days: int) -> List[Dict]:
     """
     Calculate average price trends over time
 
@@ -167,29 +227,79 @@ def get_price_trends(db: Session, days: int = 30) -> List[Dict]:
     """
     cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-    units = db.query(models.Unit).filter(
+    # Group by listing date and average in SQL
+    listed_on = func.date(models.Unit.date_listed).label('listed_on')
+    rows = db.query(
+        listed_on,
+        func.avg(models.Unit.price),
+        func.count(models.Unit.id)
+    ).filter(
         models.Unit.date_listed >= cutoff_date
-    ).all()
-
-    # Group by date and calculate average
-    price_by_date = {}
-    for unit in units:
-        date_key = unit.date_listed.date().isoformat()
-        if date_key not in price_by_date:
-            price_by_date[date_key] = []
-        price_by_date[date_key].append(unit.price)
-
-    # Calculate averages
-    trends = []
-    for date_str, prices in sorted(price_by_date.items()):
-        avg_price = sum(prices) / len(prices)
-        trends.append({
+    ).group_by(listed_on).order_by(listed_on).all()
+
+    return [
+        {
             "date": date_str,
             "average_price": round(avg_price, 2),
-            "unit_count": len(prices)
-        })
+            "unit_count": unit_count
+        }
+        for date_str, avg_price, unit_count in rows
+    ]
+
+
+def _distributions(db: Session) -> Dict:
+    """
+    Bedroom, status and city distributions from a single
+    GROUP BY bedrooms, status, city
+    Cached until a unit write invalidates it
 
-    return trends
+    Returns:
+        Dictionary with "bedrooms", "status" and "city" distributions
+    """
+    return cache.cached("distributions", lambda: _compute_distributions(db))
+
+
+def _compute_distributions(db: Session) -> Dict:
+    """
+    Count units per (bedrooms, status, city) and pivot into all three
+    distributions (one scan instead of one per dimension)
+    """
+    results = db.query(
+        models.Unit.bedrooms,
+        models.Unit.status,
+        models.Unit.city,
+        # COUNT(*) keeps ix_units_bedrooms_status_city covering (no row lookups)
+        func.count().label('count')
+    ).group_by(models.Unit.bedrooms, models.Unit.status, models.Unit.city).all()
+
+    bedroom_counts = Counter()
+    status_counts = Counter()
+    city_counts = Counter()
+    for bedrooms, status, city, count in results:
+        bedroom_counts[bedrooms] += count
+        status_counts[status] += count
+        city_counts[city] += count
+
+    # Top 10 cities by count (ties by city name, nulls first)
+    top_cities = sorted(
+        city_counts.items(),
+        key=lambda item: (-item[1], item[0] is not None, item[0] or "")
+    )[:10]
+
+    return {
+        "bedrooms": [
+            {"bedrooms": bedrooms, "count": count}
+            for bedrooms, count in sorted(bedroom_counts.items())
+        ],
+        "status": {
+            status.value: count
+            for status, count in sorted(status_counts.items(), key=lambda item: item[0].name)
+        },
+        "city": [
+            {"city": city or "Unknown", "count": count}
+            for city, count in top_cities
+        ]
+    }
 
 
 def get_bedroom_distribution(db: Session) -> List[Dict]:
@@ -199,15 +309,7 @@ def get_bedroom_distribution(db: Session) -> List[Dict]:
     Returns:
         List of bedroom counts with unit counts
     """
-    results = db.query(
-        models.Unit.bedrooms,
-        func.count(models.Unit.id).label('count')
-    ).group_by(models.Unit.bedrooms).all()
-
-    return [
-        {"bedrooms": bedrooms, "count": count}
-        for bedrooms, count in results
-    ]
+    return _distributions(db)["bedrooms"]
 
 
 def get_status_distribution(db: Session) -> Dict:
@@ -217,68 +319,50 @@ def get_status_distribution(db: Session) -> Dict:
     Returns:
         Dictionary with status counts
     """
-    statuses = db.query(
-        models.Unit.status,
-        func.count(models.Unit.id).label('count')
-    ).group_by(models.Unit.status).all()
-
-    return {
-        status.value: count
-        for status, count in statuses
-    }
+    return _distributions(db)["status"]
 
 
 def get_city_distribution(db: Session) -> List[Dict]:
     """
     Get distribution of units by city
-    Note: This requires JSON extraction (implementation varies by database)
 
     Returns:
         List of cities with unit counts
     """
-    units = db.query(models.Unit).all()
+    return _distributions(db)["city"]
 
-    city_counts = Counter()
-    for unit in units:
-        if unit.location and isinstance(unit.location, dict):
-            city = unit.location.get('city', 'Unknown')
-            city_counts[city] += 1
 
-    return [
-        {"city": city, "count": count}
-        for city, count in city_counts.most_common(10)
-    ]
+def get_performance_metrics(db: Session) -> Dict:
+    """
+    Get key performance indicators
+    Cached until a unit write invalidates it
+
+    Returns:
+        Dictionary with KPIs
+    """
+    return cache.cached("performance", lambda: _compute_performance_metrics(db))
 
 
-def get_performance_metrics(db: Session) -> Dict:
+def _compute_performance_metrics(db: Session) -> Dict:
     """
     Calculate key performance indicators
 
     Returns:
         Dictionary with KPIs
     """
-    total_units = db.query(models.Unit).count()
-    leased_units = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.LEASED
-    ).count()
-    available_units = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.AVAILABLE
-    ).count()
+    summary = get_unit_summary(db)
+    total_units = summary.total
+    leased_units = summary.leased or 0
+    available_units = summary.available or 0
 
     # Occupancy rate
     occupancy_rate = (leased_units / total_units * 100) if total_units > 0 else 0
 
     # Average lead score of available units
-    avg_lead_score = db.query(func.avg(models.Unit.lead_score)).filter(
-        models.Unit.status == models.UnitStatus.AVAILABLE
-    ).scalar() or 0
+    avg_lead_score = summary.avg_lead_score or 0
 
     # Units leased in last 30 days
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_leases = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.LEASED,
-        models.Unit.date_leased >= thirty_days_ago
-    ).count()
+    recent_leases = summary.recent_leases_30d or 0
 
     return {
         "occupancy_rate": round(occupancy_rate, 2),
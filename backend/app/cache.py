@@ -0,0 +1,96 @@
+"""
+Analytics Cache
+In-process cache for read-heavy aggregates, invalidated on unit writes
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Default time-to-live for cached values (seconds)
+# Bounds staleness of time-relative metrics (e.g. "last 30 days")
+DEFAULT_TTL = float(os.getenv("ANALYTICS_CACHE_TTL", "60"))
+
+# Upper bound on cached entries; per-unit and per-filter keys are open-ended,
+# so the least recently used entry is evicted once the cache is full
+MAX_ENTRIES = 4096
+
+# Monotonic version of the units table, bumped on every write
+_units_version = 0
+
+# key -> (units version, timestamp, value), least recently used first
+_cache: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+
+# Endpoints run in FastAPI's threadpool; guards version bumps and cache access
+_lock = threading.Lock()
+
+
+def bump_units_version() -> None:
+    """
+    Mark units table as changed
+    Called after every committed unit write; invalidates all cached values
+    """
+    global _units_version
+    with _lock:
+        _units_version += 1
+
+
+def cached(
+    key: Hashable,
+    compute: Callable[[], Any],
+    ttl: float = DEFAULT_TTL,
+    versioned: bool = True
+) -> Any:
+    """
+    Return cached value for key, computing it on miss
+
+    A value is reused only while the units version is unchanged and
+    it is younger than ttl seconds. Cached values are shared between
+    callers and must be treated as read-only. A None result is returned
+    but not stored, so lookups of missing rows don't occupy entries.
+
+    Args:
+        key: Cache key
+        compute: Zero-argument function producing the value
+        ttl: Maximum age in seconds
+        versioned: If False, only the TTL applies (unit writes don't invalidate)
+
+    Returns:
+        Cached or freshly computed value
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            version, timestamp, value = entry
+            if (not versioned or version == _units_version) and now - timestamp < ttl:
+                _cache.move_to_end(key)
+                return value
+
+    # Capture version before computing so a concurrent write invalidates it
+    # (compute runs outside the lock; concurrent misses may compute twice)
+    version = _units_version
+    value = compute()
+    if value is None:
+        return None
+    with _lock:
+        _cache[key] = (version, now, value)
+        _cache.move_to_end(key)
+        if len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return value
+
+
+def clear() -> None:
+    """
+    Drop all cached values
+    Used by tests to isolate cases that share the module-level cache
+    """
+    with _lock:
+        _cache.clear()
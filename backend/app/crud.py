@@ -4,10 +4,13 @@ Database operations for apartment units
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
+from sqlalchemy import and_, or_, func, select, tuple_
+from sqlalchemy.engine import Row
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
-from . import models, schemas
+import base64
+import json
+from . import models, schemas, cache, lead_scoring
 
 
 def get_unit(db: Session, unit_id: str) -> Optional[models.Unit]:
@@ -17,6 +20,45 @@ def get_unit(db: Session, unit_id: str) -> Optional[models.Unit]:
     return db.query(models.Unit).filter(models.Unit.id == unit_id).first()
 
 
+def encode_cursor(unit: models.Unit) -> str:
+    """
+    Encode keyset pagination cursor (lead_score, id) for the given unit
+    """
+    payload = json.dumps([unit.lead_score, unit.id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[float], str]:
+    """
+    Decode keyset pagination cursor
+    lead_score is None for cursors issued on an unscored unit
+
+    Raises:
+        ValueError: If cursor is malformed
+    """
+    try:
+        lead_score, unit_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (None if lead_score is None else float(lead_score)), str(unit_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _after_cursor(cursor: Tuple[Optional[float], str]):
+    """
+    Keyset predicate for units after cursor in (lead_score DESC, id DESC) order
+    SQLite sorts NULL scores last in DESC order, so unscored units follow
+    every scored one and are paged among themselves by id
+    """
+    lead_score, unit_id = cursor
+    if lead_score is None:
+        return and_(models.Unit.lead_score.is_(None), models.Unit.id < unit_id)
+
+    return or_(
+        tuple_(models.Unit.lead_score, models.Unit.id) < tuple_(lead_score, unit_id),
+        models.Unit.lead_score.is_(None)
+    )
+
+
 def get_units(
     db: Session,
     skip: int = 0,
@@ -25,20 +67,23 @@ def get_units(
     bedrooms: Optional[int] = None,
     price_min: Optional[int] = None,
     price_max: Optional[int] = None,
-    city: Optional[str] = None
+    city: Optional[str] = None,
+    cursor: Optional[Tuple[Optional[float], str]] = None
 ) -> List[models.Unit]:
     """
     Get units with optional filtering
 
     Args:
         db: Database session
-        skip: Number of records to skip (pagination)
+        skip: Number of records to skip (offset pagination)
         limit: Maximum number of records to return
         status: Filter by unit status (available, pending, leased)
         bedrooms: Filter by number of bedrooms
         price_min: Minimum price filter
         price_max: Maximum price filter
         city: Filter by city
+        cursor: (lead_score, id) of last unit seen (keyset pagination,
+            takes precedence over skip)
 
     Returns:
         List of Unit objects matching filters
@@ -59,13 +104,20 @@ def get_units(
         query = query.filter(models.Unit.price <= price_max)
 
     if city:
-        # JSON field filtering (SQLite-compatible)
-        query = query.filter(models.Unit.location.contains(city))
+        # Exact match on the denormalized city column (indexed)
+        query = query.filter(models.Unit.city == city)
 
     # Order by lead score descending (highest priority first)
-    query = query.order_by(models.Unit.lead_score.desc())
+    # id breaks ties so keyset pagination has a stable total order
+    query = query.order_by(models.Unit.lead_score.desc(), models.Unit.id.desc())
+
+    if cursor is not None:
+        # Keyset pagination: seek past the last unit instead of OFFSET
+        query = query.filter(_after_cursor(cursor))
+    else:
+        query = query.offset(skip)
 
-    return query.offset(skip).limit(limit).all()
+    return query.limit(limit).all()
 
 
 def get_units_count(
@@ -73,12 +125,32 @@ def get_units_count(
     status: Optional[str] = None,
     bedrooms: Optional[int] = None,
     price_min: Optional[int] = None,
-    price_max: Optional[int] = None
+    price_max: Optional[int] = None,
+    city: Optional[str] = None
 ) -> int:
     """
     Get count of units matching filters (for pagination)
+    Cached per filter combination until a unit write invalidates it
     """
-    query = db.query(models.Unit)
+    return cache.cached(
+        ("units_count", status, bedrooms, price_min, price_max, city),
+        lambda: _count_units(db, status, bedrooms, price_min, price_max, city)
+    )
+
+
+def _count_units(
+    db: Session,
+    status: Optional[str],
+    bedrooms: Optional[int],
+    price_min: Optional[int],
+    price_max: Optional[int],
+    city: Optional[str]
+) -> int:
+    """
+    Count units matching filters
+    """
+    # COUNT directly on the table (Query.count() wraps a full-row subquery)
+    query = db.query(func.count(models.Unit.id))
 
     if status:
         query = query.filter(models.Unit.status == status)
@@ -88,13 +160,25 @@ def get_units_count(
         query = query.filter(models.Unit.price >= price_min)
     if price_max is not None:
         query = query.filter(models.Unit.price <= price_max)
+    if city:
+        query = query.filter(models.Unit.city == city)
 
-    return query.count()
+    return query.scalar()
 
 
-def create_unit(db: Session, unit: schemas.UnitCreate) -> models.Unit:
+def create_unit(
+    db: Session,
+    unit: schemas.UnitCreate,
+    compute_score: bool = False
+) -> models.Unit:
     """
     Create a new apartment unit
+
+    Args:
+        db: Database session
+        unit: Unit data
+        compute_score: Calculate the initial lead score before the insert
+            (same transaction, no follow-up UPDATE)
     """
     db_unit = models.Unit(
         property_name=unit.property_name,
@@ -111,9 +195,13 @@ def create_unit(db: Session, unit: schemas.UnitCreate) -> models.Unit:
         date_listed=datetime.utcnow()
     )
 
+    if compute_score:
+        market_data = lead_scoring.get_market_data(db)
+        db_unit.lead_score = lead_scoring.calculate_lead_score(db_unit, market_data)
+
     db.add(db_unit)
     db.commit()
-    db.refresh(db_unit)
+    cache.bump_units_version()
 
     return db_unit
 
@@ -121,11 +209,19 @@ def create_unit(db: Session, unit: schemas.UnitCreate) -> models.Unit:
 def update_unit(
     db: Session,
     unit_id: str,
-    unit_update: schemas.UnitUpdate
+    unit_update: schemas.UnitUpdate,
+    recompute_score: bool = False
 ) -> Optional[models.Unit]:
     """
     Update an existing unit
     Key operation for leasing workflow (status changes)
+
+    Args:
+        db: Database session
+        unit_id: Unit to update
+        unit_update: Fields to change
+        recompute_score: Recalculate the lead score in the same transaction
+            if the unit is (still) available; skipped otherwise
     """
     db_unit = get_unit(db, unit_id)
 
@@ -147,10 +243,15 @@ def update_unit(
     for key, value in update_data.items():
         setattr(db_unit, key, value)
 
+    # Only available units are prioritized, so skip market data otherwise
+    if recompute_score and db_unit.status == models.UnitStatus.AVAILABLE:
+        market_data = lead_scoring.get_market_data(db)
+        db_unit.lead_score = lead_scoring.calculate_lead_score(db_unit, market_data)
+
     db_unit.updated_at = datetime.utcnow()
 
     db.commit()
-    db.refresh(db_unit)
+    cache.bump_units_version()
 
     return db_unit
 
@@ -166,10 +267,66 @@ def delete_unit(db: Session, unit_id: str) -> bool:
 
     db.delete(db_unit)
     db.commit()
+    cache.bump_units_version()
 
     return True
 
 
+def stream_units(
+    db: Session,
+    status: Optional[models.UnitStatus] = None,
+    limit: int = 100,
+    cursor: Optional[Tuple[Optional[float], str]] = None
+) -> Iterator[Row]:
+    """
+    Iterate units in lead score order as lightweight rows
+    Fetched in batches (yield_per), so memory stays bounded by the batch size
+
+    Args:
+        db: Database session
+        status: Filter by unit status
+        limit: Maximum number of rows to yield
+        cursor: (lead_score, id) of last unit seen (keyset pagination)
+    """
+    stmt = select(*models.Unit.__table__.columns)
+    if status:
+        stmt = stmt.where(models.Unit.status == status)
+    if cursor is not None:
+        stmt = stmt.where(_after_cursor(cursor))
+    stmt = stmt.order_by(
+        models.Unit.lead_score.desc(), models.Unit.id.desc()
+    ).limit(limit).execution_options(yield_per=100)
+
+    yield from db.execute(stmt)
+
+
+def get_page_end_cursor(
+    db: Session,
+    status: Optional[models.UnitStatus] = None,
+    limit: int = 100,
+    cursor: Optional[Tuple[Optional[float], str]] = None
+) -> Optional[str]:
+    """
+    Cursor for the last unit of a full page in lead score order
+    Reads only (lead_score, id), so a streamed page can announce its next
+    cursor before the rows are sent
+
+    Returns:
+        Encoded cursor, or None if fewer than limit units remain
+    """
+    query = db.query(models.Unit.lead_score, models.Unit.id)
+    if status:
+        query = query.filter(models.Unit.status == status)
+    if cursor is not None:
+        query = query.filter(_after_cursor(cursor))
+
+    last = query.order_by(
+        models.Unit.lead_score.desc(), models.Unit.id.desc()
+    ).offset(limit - 1).limit(1).first()
+
+    return encode_cursor(last) if last else None
+
+
 def get_leased_units(db: Session) -> List[models.Unit]:
     """
     Get all leased units (for analytics)
@@ -191,7 +348,8 @@ def get_available_units(db: Session) -> List[models.Unit]:
 def update_lead_score(db: Session, unit_id: str, new_score: float) -> Optional[models.Unit]:
     """
     Update lead score for a unit
-    Called by lead scoring algorithm
+    Called by lead scoring algorithm (update_unit sets the score itself
+    in its own commit, so API writes don't go through here)
     """
     db_unit = get_unit(db, unit_id)
 
@@ -202,6 +360,6 @@ def update_lead_score(db: Session, unit_id: str, new_score: float) -> Optional[m
     db_unit.updated_at = datetime.utcnow()
 
     db.commit()
-    db.refresh(db_unit)
+    cache.bump_units_version()
 
     return db_unit
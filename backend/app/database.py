@@ -3,9 +3,10 @@ Database Configuration
 SQLite connection and session management for apartment leasing demo
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
 import os
 from dotenv import load_dotenv
 
@@ -22,8 +23,29 @@ engine = create_engine(
     connect_args={"check_same_thread": False}
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune each new SQLite connection
+    WAL lets dashboard reads proceed while PATCH bursts write
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, fewer fsyncs
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.close()
+
+
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps just-written objects loaded after commit;
+# all column defaults are Python-side, so no refresh SELECT is needed
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for ORM models
 Base = declarative_base()
@@ -41,9 +63,50 @@ def get_db():
         db.close()
 
 
+def _add_missing_columns(connection) -> set:
+    """
+    Add columns declared on models but missing from existing tables
+    Lightweight migration for the demo database (create_all never alters)
+
+    Returns:
+        Set of (table, column) names that were added
+    """
+    inspector = inspect(connection)
+    added = set()
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                ))
+                added.add((table.name, column.name))
+    return added
+
+
 def init_db():
     """
     Initialize database - create all tables
     Called on application startup
     """
+    from . import models  # noqa: F401 - register tables on Base.metadata
+
     Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as connection:
+        added = _add_missing_columns(connection)
+
+        # Backfill denormalized location columns on pre-existing rows
+        if ("units", "city") in added or ("units", "zip") in added:
+            connection.execute(text(
+                "UPDATE units SET city = json_extract(location, '$.city'), "
+                "zip = json_extract(location, '$.zip')"
+            ))
+
+    # create_all skips existing tables, so add any indexes declared since
+    # (IF NOT EXISTS in one statement per index instead of reflecting first)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
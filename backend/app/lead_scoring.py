@@ -4,13 +4,109 @@ Automated lead prioritization for apartment units
 Rule-based scoring system demonstrating AI/automation logic
 """
 
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from typing import Dict, List
-from . import models
+from functools import lru_cache
+import math
+import os
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from . import models, cache
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
 
 
-def calculate_lead_score(unit: models.Unit, market_data: Dict) -> float:
+# Points per desirable amenity (anything else scores 1)
+HIGH_VALUE_AMENITIES = {
+    'parking': 7,
+    'washer_dryer': 6,
+    'pet_friendly': 5,
+    'balcony': 4,
+    'dishwasher': 3,
+    'fitness_center': 4,
+    'pool': 4,
+    'ac': 3
+}
+
+# Louisville prime zip codes (example)
+PRIME_ZIPS = frozenset(('40202', '40204', '40206', '40207', '40222'))
+
+
+@lru_cache(maxsize=1024)
+def _amenity_value(amenity: str) -> int:
+    """
+    Points for a single amenity name
+    Memoized: the amenity vocabulary is small, so normalization runs once per name
+    """
+    return HIGH_VALUE_AMENITIES.get(amenity.lower().replace(' ', '_'), 1)
+
+
+def _amenity_points(amenities: List[str]) -> int:
+    """
+    Score desirable features, capped at 20 points
+    """
+    return min(20, sum(_amenity_value(amenity) for amenity in amenities))
+
+
+@lru_cache(maxsize=4096)
+def _location_points(city: Optional[str], zip_code: Optional[str]) -> int:
+    """
+    Score location desirability (prime zip codes, city)
+    Uses the denormalized Unit.city / Unit.zip columns
+    Memoized: few distinct (city, zip) pairs, so batch scoring is a lookup per row
+    """
+    points = 0
+
+    if zip_code in PRIME_ZIPS:
+        points += 10
+
+    # City-level desirability
+    if city and 'louisville' in city.lower():
+        points += 5
+
+    return points
+
+
+# Threshold rules as step tables, shared by calculate_lead_score and the
+# vectorized calculate_lead_scores so the two cannot drift apart.
+# points[i] applies when exactly i edges are <= value (bisect_right /
+# searchsorted side='right'); nextafter turns strict ">" thresholds into
+# inclusive edges.
+
+# Price vs market average: <0.85 excellent deal, <0.95 good value,
+# >1.05 slightly expensive, >1.15 overpriced
+PRICE_RATIO_EDGES = (0.85, 0.95, math.nextafter(1.05, math.inf), math.nextafter(1.15, math.inf))
+PRICE_RATIO_POINTS = (20, 10, 0, -5, -15)
+
+# Days listed: <3 hot, <7 recent, <14 fresh, >30 getting stale, >45 stale
+DAYS_LISTED_EDGES = (3, 7, 14, 31, 46)
+DAYS_LISTED_POINTS = (15, 10, 5, 0, -10, -15)
+
+# 2+ bedrooms have higher demand
+BEDROOM_EDGES = (1, 2, 3)
+BEDROOM_POINTS = (0, 3, 7, 10)
+
+# Multiple bathrooms increase appeal
+BATHROOM_EDGES = (1.5, 2.0)
+BATHROOM_POINTS = (0, 3, 5)
+
+# Price per sqft below this fraction of the market average is great space value
+SQFT_VALUE_RATIO = 0.9
+SQFT_VALUE_POINTS = 5
+
+
+def _step(value: float, edges: Sequence[float], points: Sequence[int]) -> int:
+    """
+    Points for value from a step table
+    """
+    return points[bisect_right(edges, value)]
+
+
+def calculate_lead_score(
+    unit: models.Unit,
+    market_data: Dict,
+    now: Optional[datetime] = None
+) -> float:
     """
     Calculate lead score for an apartment unit (0-100)
 
@@ -27,95 +123,41 @@ def calculate_lead_score(unit: models.Unit, market_data: Dict) -> float:
     Args:
         unit: Unit object to score
         market_data: Dictionary containing market statistics
+        now: Reference time for listing freshness (defaults to utcnow)
 
     Returns:
         Score from 0-100 (higher = more likely to lease quickly)
     """
+    if now is None:
+        now = datetime.utcnow()
+
     score = 50.0  # Base score
 
     # 1. Price Competitiveness (±20 points)
     market_avg_price = market_data.get('average_price', 1500)
     price_ratio = unit.price / market_avg_price
-
-    if price_ratio < 0.85:
-        score += 20  # Excellent deal
-    elif price_ratio < 0.95:
-        score += 10  # Good value
-    elif price_ratio > 1.15:
-        score -= 15  # Overpriced
-    elif price_ratio > 1.05:
-        score -= 5   # Slightly expensive
+    score += _step(price_ratio, PRICE_RATIO_EDGES, PRICE_RATIO_POINTS)
 
     # 2. Listing Freshness (±15 points)
-    days_listed = (datetime.utcnow() - unit.date_listed).days
-
-    if days_listed < 3:
-        score += 15  # Hot new listing (urgency)
-    elif days_listed < 7:
-        score += 10  # Recent
-    elif days_listed < 14:
-        score += 5   # Fresh
-    elif days_listed > 45:
-        score -= 15  # Stale, needs price adjustment
-    elif days_listed > 30:
-        score -= 10  # Getting stale
+    days_listed = (now - unit.date_listed).days
+    score += _step(days_listed, DAYS_LISTED_EDGES, DAYS_LISTED_POINTS)
 
     # 3. Desirable Features (±20 points)
-    high_value_amenities = {
-        'parking': 7,
-        'washer_dryer': 6,
-        'pet_friendly': 5,
-        'balcony': 4,
-        'dishwasher': 3,
-        'fitness_center': 4,
-        'pool': 4,
-        'ac': 3
-    }
-
-    amenity_score = 0
-    for amenity in unit.amenities:
-        amenity_lower = amenity.lower().replace(' ', '_')
-        amenity_score += high_value_amenities.get(amenity_lower, 1)
-
-    # Cap amenity bonus at 20 points
-    score += min(20, amenity_score)
+    score += _amenity_points(unit.amenities)
 
     # 4. Unit Size Appeal (±10 points)
-    # 2+ bedrooms have higher demand
-    if unit.bedrooms >= 3:
-        score += 10
-    elif unit.bedrooms == 2:
-        score += 7
-    elif unit.bedrooms == 1:
-        score += 3
-
-    # Multiple bathrooms increase appeal
-    if unit.bathrooms >= 2.0:
-        score += 5
-    elif unit.bathrooms >= 1.5:
-        score += 3
+    score += _step(unit.bedrooms, BEDROOM_EDGES, BEDROOM_POINTS)
+    score += _step(unit.bathrooms, BATHROOM_EDGES, BATHROOM_POINTS)
 
     # Square footage value
     price_per_sqft = unit.price / unit.square_feet
     market_avg_price_per_sqft = market_data.get('average_price_per_sqft', 1.5)
 
-    if price_per_sqft < market_avg_price_per_sqft * 0.9:
-        score += 5  # Great space value
+    if price_per_sqft < market_avg_price_per_sqft * SQFT_VALUE_RATIO:
+        score += SQFT_VALUE_POINTS
 
     # 5. Location Desirability (±10 points)
-    location = unit.location
-    if isinstance(location, dict):
-        city = location.get('city', '').lower()
-        zip_code = location.get('zip', '')
-
-        # Louisville prime zip codes (example)
-        prime_zips = ['40202', '40204', '40206', '40207', '40222']
-        if zip_code in prime_zips:
-            score += 10
-
-        # City-level desirability
-        if 'louisville' in city:
-            score += 5
+    score += _location_points(unit.city, unit.zip)
 
     # Clamp score to 0-100 range
     final_score = max(0.0, min(100.0, score))
@@ -123,14 +165,89 @@ def calculate_lead_score(unit: models.Unit, market_data: Dict) -> float:
     return round(final_score, 2)
 
 
-def calculate_score_breakdown(unit: models.Unit, market_data: Dict) -> Dict:
+def _step_points(values: np.ndarray, edges: Sequence[float], points: Sequence[int]) -> np.ndarray:
+    """
+    Vectorized _step: one binary search per value over the same step table
+    """
+    return np.asarray(points)[np.searchsorted(np.asarray(edges), values, side='right')]
+
+
+def calculate_lead_scores(
+    units: Sequence,
+    market_data: Dict,
+    now: Optional[datetime] = None
+) -> np.ndarray:
+    """
+    Vectorized calculate_lead_score over a batch of units
+    Applies the same rules as calculate_lead_score using NumPy arrays;
+    threshold rules are step-table lookups (np.searchsorted), so they run
+    branch-free in C rather than per-row Python
+
+    Args:
+        units: Objects exposing Unit scoring attributes (ORM units or rows)
+        market_data: Dictionary containing market statistics
+        now: Reference time for listing freshness (defaults to utcnow)
+
+    Returns:
+        Array of scores (0-100) aligned with units
+    """
+    count = len(units)
+    price = np.fromiter((u.price for u in units), dtype=np.float64, count=count)
+    bedrooms = np.fromiter((u.bedrooms for u in units), dtype=np.int64, count=count)
+    bathrooms = np.fromiter((u.bathrooms for u in units), dtype=np.float64, count=count)
+    square_feet = np.fromiter((u.square_feet for u in units), dtype=np.float64, count=count)
+    date_listed = np.array([u.date_listed for u in units], dtype='datetime64[us]')
+
+    score = np.full(count, 50.0)
+
+    # 1. Price Competitiveness (±20 points)
+    price_ratio = price / market_data.get('average_price', 1500)
+    score += _step_points(price_ratio, PRICE_RATIO_EDGES, PRICE_RATIO_POINTS)
+
+    # 2. Listing Freshness (±15 points)
+    reference = np.datetime64(now or datetime.utcnow(), 'us')
+    days_listed = (reference - date_listed) // np.timedelta64(1, 'D')
+    score += _step_points(days_listed, DAYS_LISTED_EDGES, DAYS_LISTED_POINTS)
+
+    # 3. Desirable Features (±20 points) - string matching stays per unit
+    score += np.fromiter((_amenity_points(u.amenities) for u in units), dtype=np.float64, count=count)
+
+    # 4. Unit Size Appeal (±10 points)
+    score += _step_points(bedrooms, BEDROOM_EDGES, BEDROOM_POINTS)
+    score += _step_points(bathrooms, BATHROOM_EDGES, BATHROOM_POINTS)
+
+    market_avg_price_per_sqft = market_data.get('average_price_per_sqft', 1.5)
+    score += np.where(
+        price / square_feet < market_avg_price_per_sqft * SQFT_VALUE_RATIO, SQFT_VALUE_POINTS, 0
+    )
+
+    # 5. Location Desirability (±10 points)
+    score += np.fromiter((_location_points(u.city, u.zip) for u in units), dtype=np.float64, count=count)
+
+    # Clamp score to 0-100 range
+    return np.round(np.clip(score, 0.0, 100.0), 2)
+
+
+def calculate_score_breakdown(
+    unit: models.Unit,
+    market_data: Dict,
+    now: Optional[datetime] = None
+) -> Dict:
     """
     Calculate lead score with detailed breakdown
     Useful for explaining scoring to users
 
+    Args:
+        unit: Unit object to score
+        market_data: Dictionary containing market statistics
+        now: Reference time for listing freshness (defaults to utcnow)
+
     Returns:
         Dictionary with score and component breakdown
     """
+    if now is None:
+        now = datetime.utcnow()
+
     breakdown = {
         'total_score': 50.0,
         'components': {
@@ -164,7 +281,7 @@ def calculate_score_breakdown(unit: models.Unit, market_data: Dict) -> Dict:
     score += price_points
 
     # Listing Freshness
-    days_listed = (datetime.utcnow() - unit.date_listed).days
+    days_listed = (now - unit.date_listed).days
     if days_listed < 3:
         freshness_points = 15
         breakdown['explanation'].append(f"Brand new listing ({days_listed} days)")
@@ -178,37 +295,86 @@ def calculate_score_breakdown(unit: models.Unit, market_data: Dict) -> Dict:
     score += freshness_points
 
     # Calculate final score
-    total_score = calculate_lead_score(unit, market_data)
+    total_score = calculate_lead_score(unit, market_data, now)
     breakdown['total_score'] = total_score
 
     return breakdown
 
 
+# Market averages move slowly; a short TTL keeps PATCH bursts from
+# rescanning all available units on every request
+MARKET_DATA_TTL = float(os.getenv("MARKET_DATA_CACHE_TTL", "30"))  # seconds
+
+
 def get_market_data(db: Session) -> Dict:
+    """
+    Get market statistics for lead scoring
+    Cached for MARKET_DATA_TTL seconds, independent of unit writes
+
+    Returns:
+        Dictionary with market averages
+    """
+    return cache.cached(
+        "market_data",
+        lambda: compute_market_data(db),
+        ttl=MARKET_DATA_TTL,
+        versioned=False
+    )
+
+
+def get_score_breakdown(db: Session, unit_id: str) -> Optional[Dict]:
+    """
+    Get lead score breakdown for a unit
+    Cached per unit until a unit write invalidates it (market data is
+    derived from units as well). A cache hit runs no queries; unknown
+    ids are looked up on every call and never cached.
+
+    Returns:
+        Score breakdown, or None if the unit does not exist
+    """
+    return cache.cached(
+        ("score_breakdown", unit_id),
+        lambda: _compute_score_breakdown(db, unit_id)
+    )
+
+
+def _compute_score_breakdown(db: Session, unit_id: str) -> Optional[Dict]:
+    """
+    Load unit and calculate its score breakdown against current market data
+    """
+    unit = db.query(models.Unit).filter(models.Unit.id == unit_id).first()
+    if not unit:
+        return None
+
+    return calculate_score_breakdown(unit, get_market_data(db))
+
+
+def compute_market_data(db: Session) -> Dict:
     """
     Calculate market statistics for lead scoring
 
     Returns:
         Dictionary with market averages
     """
-    units = db.query(models.Unit).filter(
+    total_price, total_sqft, unit_count = db.query(
+        func.sum(models.Unit.price),
+        func.sum(models.Unit.square_feet),
+        func.count(models.Unit.id)
+    ).filter(
         models.Unit.status == models.UnitStatus.AVAILABLE
-    ).all()
+    ).one()
 
-    if not units:
+    if not unit_count:
         return {
             'average_price': 1500,
             'average_price_per_sqft': 1.5,
             'total_units': 0
         }
 
-    total_price = sum(u.price for u in units)
-    total_sqft = sum(u.square_feet for u in units)
-
     return {
-        'average_price': total_price / len(units),
+        'average_price': total_price / unit_count,
         'average_price_per_sqft': total_price / total_sqft,
-        'total_units': len(units)
+        'total_units': unit_count
     }
 
 
@@ -220,18 +386,43 @@ def recalculate_all_scores(db: Session) -> int:
     Returns:
         Number of units updated
     """
-    market_data = get_market_data(db)
-    units = db.query(models.Unit).filter(
-        models.Unit.status == models.UnitStatus.AVAILABLE
+    # Batch job always scores against fresh market data
+    market_data = compute_market_data(db)
+    # Load only the scoring columns as lightweight rows
+    units = db.execute(
+        select(
+            models.Unit.id,
+            models.Unit.lead_score,
+            models.Unit.price,
+            models.Unit.bedrooms,
+            models.Unit.bathrooms,
+            models.Unit.square_feet,
+            models.Unit.date_listed,
+            models.Unit.amenities,
+            models.Unit.city,
+            models.Unit.zip
+        ).where(models.Unit.status == models.UnitStatus.AVAILABLE)
     ).all()
 
-    updated_count = 0
-    for unit in units:
-        new_score = calculate_lead_score(unit, market_data)
-        if unit.lead_score != new_score:
-            unit.lead_score = new_score
-            unit.updated_at = datetime.utcnow()
-            updated_count += 1
-
+    # One reference time for the whole batch (freshness and updated_at)
+    now = datetime.utcnow()
+    new_scores = calculate_lead_scores(units, market_data, now).tolist() if units else []
+
+    # Only write rows whose score actually changed
+    changes = [
+        {"id": unit.id, "lead_score": new_score, "updated_at": now}
+        for unit, new_score in zip(units, new_scores)
+        if unit.lead_score != new_score
+    ]
+
+    if not changes:
+        return 0
+
+    # Single executemany UPDATE keyed on primary key: one prepared statement
+    # in one transaction. SQLite is in-process, so an UPDATE ... FROM (VALUES)
+    # batch saves no round trips here (and would need manual chunking to stay
+    # under the bound-parameter limit)
+    db.execute(update(models.Unit), changes)
     db.commit()
-    return updated_count
+    cache.bump_units_version()
+    return len(changes)
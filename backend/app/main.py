@@ -3,25 +3,35 @@ FastAPI Main Application
 Apartment Leasing Demo - Real-time Integration System
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Any, Optional, List, Tuple
+import hashlib
 import logging
+import orjson
 
-from . import models, schemas, crud, analytics, lead_scoring
-from .database import engine, get_db, init_db
+from . import models, schemas, crud, analytics, lead_scoring, cache
+from .database import engine, get_db, init_db, SessionLocal
 from .websocket_manager import manager
 
+# Seconds a successful database health probe is reused
+# Load balancer / orchestrator probes poll /health every few seconds
+HEALTH_CHECK_TTL = 5.0
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
+# orjson (C extension) encodes responses; unit lists dominate encoder CPU
 app = FastAPI(
     title="Apartment Leasing API",
     description="Real-time apartment listing and leasing management system",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -34,6 +44,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -84,6 +95,11 @@ async def websocket_endpoint(websocket: WebSocket):
 # ============================================================================
 # Unit Management Endpoints
 # ============================================================================
+# Endpoints that only touch the database are plain `def`: FastAPI runs them
+# in its threadpool, so blocking SQLAlchemy calls don't stall the event loop
+# (and WebSocket traffic). Write endpoints stay `async` because queuing a
+# broadcast must happen on the event loop; their database work is handed to
+# the threadpool with run_in_threadpool.
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -99,7 +115,7 @@ async def root():
 
 
 @app.get("/api/units", response_model=schemas.UnitListResponse, tags=["Units"])
-async def get_units(
+def get_units(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None, description="Filter by status: available, pending, leased"),
@@ -107,6 +123,7 @@ async def get_units(
     price_min: Optional[int] = Query(None, ge=0),
     price_max: Optional[int] = Query(None, ge=0),
     city: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous next_cursor (not combinable with skip)"),
     db: Session = Depends(get_db)
 ):
     """
@@ -122,7 +139,18 @@ async def get_units(
     **Pagination:**
     - skip: Number of records to skip
     - limit: Maximum records to return
+    - cursor: Pass the previous response's next_cursor to fetch the next
+      page without OFFSET (constant cost at any depth; cannot be combined
+      with skip)
     """
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both")
+
+    try:
+        keyset = crud.decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
     units = crud.get_units(
         db,
         skip=skip,
@@ -131,7 +159,8 @@ async def get_units(
         bedrooms=bedrooms,
         price_min=price_min,
         price_max=price_max,
-        city=city
+        city=city,
+        cursor=keyset
     )
 
     total = crud.get_units_count(
@@ -139,19 +168,21 @@ async def get_units(
         status=status,
         bedrooms=bedrooms,
         price_min=price_min,
-        price_max=price_max
+        price_max=price_max,
+        city=city
     )
 
     return {
         "units": units,
         "total": total,
         "page": skip // limit + 1 if limit > 0 else 1,
-        "page_size": limit
+        "page_size": limit,
+        "next_cursor": crud.encode_cursor(units[-1]) if len(units) == limit else None
     }
 
 
 @app.get("/api/units/{unit_id}", response_model=schemas.UnitResponse, tags=["Units"])
-async def get_unit(unit_id: str, db: Session = Depends(get_db)):
+def get_unit(unit_id: str, db: Session = Depends(get_db)):
     """
     Get specific unit by ID
     """
@@ -166,19 +197,11 @@ async def create_unit(unit: schemas.UnitCreate, db: Session = Depends(get_db)):
     """
     Create a new apartment unit (admin operation)
     """
-    # Create unit
-    db_unit = crud.create_unit(db, unit)
-
-    # Calculate initial lead score
-    market_data = lead_scoring.get_market_data(db)
-    lead_score = lead_scoring.calculate_lead_score(db_unit, market_data)
-    crud.update_lead_score(db, db_unit.id, lead_score)
-
-    # Refresh to get updated score
-    db.refresh(db_unit)
+    # Create unit with its initial lead score (single commit)
+    db_unit = await run_in_threadpool(crud.create_unit, db, unit, compute_score=True)
 
-    # Broadcast new unit to all connected clients
-    await manager.broadcast_unit_update(db_unit.to_dict())
+    # Broadcast new unit to all connected clients (batched)
+    manager.queue_unit_update(db_unit.to_dict())
 
     logger.info(f"Created new unit: {db_unit.id}")
     return db_unit
@@ -200,20 +223,16 @@ async def update_unit(
 
     **Real-time:** All connected clients notified instantly via WebSocket
     """
-    db_unit = crud.update_unit(db, unit_id, unit_update)
+    # Lead score is recalculated in the same commit if unit is still available
+    db_unit = await run_in_threadpool(
+        crud.update_unit, db, unit_id, unit_update, recompute_score=True
+    )
 
     if not db_unit:
         raise HTTPException(status_code=404, detail="Unit not found")
 
-    # Recalculate lead score if unit is still available
-    if db_unit.status == models.UnitStatus.AVAILABLE:
-        market_data = lead_scoring.get_market_data(db)
-        new_score = lead_scoring.calculate_lead_score(db_unit, market_data)
-        crud.update_lead_score(db, unit_id, new_score)
-        db.refresh(db_unit)
-
-    # Broadcast update to all connected clients
-    await manager.broadcast_unit_update(db_unit.to_dict())
+    # Broadcast update to all connected clients (batched)
+    manager.queue_unit_update(db_unit.to_dict())
 
     logger.info(f"Updated unit: {unit_id}, new status: {db_unit.status}")
     return db_unit
@@ -224,13 +243,13 @@ async def delete_unit(unit_id: str, db: Session = Depends(get_db)):
     """
     Delete a unit (admin operation)
     """
-    success = crud.delete_unit(db, unit_id)
+    success = await run_in_threadpool(crud.delete_unit, db, unit_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Unit not found")
 
-    # Broadcast deletion to all connected clients
-    await manager.broadcast_unit_deleted(unit_id)
+    # Broadcast deletion to all connected clients (batched)
+    manager.queue_unit_deleted(unit_id)
 
     logger.info(f"Deleted unit: {unit_id}")
     return None
@@ -240,8 +259,24 @@ async def delete_unit(unit_id: str, db: Session = Depends(get_db)):
 # Analytics Endpoints
 # ============================================================================
 
+def _conditional_json(request: Request, content: Any) -> Response:
+    """
+    JSON response with an ETag; answers 304 when the client's copy is current
+    Clients must revalidate (no-cache), so live dashboards never show stale data,
+    but an unchanged payload costs a header round trip instead of the body
+    """
+    body = orjson.dumps(content)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/analytics", response_model=schemas.AnalyticsResponse, tags=["Analytics"])
-async def get_analytics(db: Session = Depends(get_db)):
+def get_analytics(request: Request, db: Session = Depends(get_db)):
     """
     Get comprehensive analytics dashboard data
 
@@ -254,36 +289,40 @@ async def get_analytics(db: Session = Depends(get_db)):
     - Price trends
     """
     analytics_data = analytics.get_dashboard_analytics(db)
-    return analytics_data
+    return _conditional_json(request, analytics_data)
 
 
 @app.get("/api/analytics/trends", tags=["Analytics"])
-async def get_trends(days: int = Query(30, ge=1, le=365), db: Session = Depends(get_db)):
+def get_trends(
+    request: Request,
+    days: int = Query(30, ge=1, le=365),
+    db: Session = Depends(get_db)
+):
     """
     Get price trends over time
     """
     trends = analytics.get_price_trends(db, days=days)
-    return {"trends": trends}
+    return _conditional_json(request, {"trends": trends})
 
 
 @app.get("/api/analytics/distribution", tags=["Analytics"])
-async def get_distribution(db: Session = Depends(get_db)):
+def get_distribution(request: Request, db: Session = Depends(get_db)):
     """
     Get distribution metrics (bedrooms, status, city)
     """
-    return {
+    return _conditional_json(request, {
         "bedroom_distribution": analytics.get_bedroom_distribution(db),
         "status_distribution": analytics.get_status_distribution(db),
         "city_distribution": analytics.get_city_distribution(db)
-    }
+    })
 
 
 @app.get("/api/analytics/performance", tags=["Analytics"])
-async def get_performance_metrics(db: Session = Depends(get_db)):
+def get_performance_metrics(request: Request, db: Session = Depends(get_db)):
     """
     Get key performance indicators (KPIs)
     """
-    return analytics.get_performance_metrics(db)
+    return _conditional_json(request, analytics.get_performance_metrics(db))
 
 
 # ============================================================================
@@ -291,17 +330,14 @@ async def get_performance_metrics(db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.get("/api/leads/score/{unit_id}", response_model=schemas.LeadScoreResponse, tags=["Lead Scoring"])
-async def get_lead_score(unit_id: str, db: Session = Depends(get_db)):
+def get_lead_score(unit_id: str, db: Session = Depends(get_db)):
     """
     Get calculated lead score for specific unit with breakdown
     """
-    unit = crud.get_unit(db, unit_id)
-    if not unit:
+    score_breakdown = lead_scoring.get_score_breakdown(db, unit_id)
+    if score_breakdown is None:
         raise HTTPException(status_code=404, detail="Unit not found")
 
-    market_data = lead_scoring.get_market_data(db)
-    score_breakdown = lead_scoring.calculate_score_breakdown(unit, market_data)
-
     return {
         "unit_id": unit_id,
         "lead_score": score_breakdown['total_score'],
@@ -310,27 +346,72 @@ async def get_lead_score(unit_id: str, db: Session = Depends(get_db)):
 
 
 @app.get("/api/leads/prioritized", response_model=List[schemas.UnitResponse], tags=["Lead Scoring"])
-async def get_prioritized_units(
+def get_prioritized_units(
+    request: Request,
+    response: Response,
     limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous X-Next-Cursor header"),
     db: Session = Depends(get_db)
 ):
     """
     Get units sorted by lead score (highest priority first)
 
     **Use case:** Auto-prioritize which units to promote/market first
+
+    **Pagination:** When a full page is returned, the `X-Next-Cursor`
+    response header holds a cursor for the next page (keyset, no OFFSET)
+
+    **Streaming:** Send `Accept: application/x-ndjson` to receive one unit
+    per line as rows are read, instead of one buffered JSON array
+    (`cursor` and `X-Next-Cursor` work the same way)
     """
+    try:
+        keyset = crud.decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        next_cursor = crud.get_page_end_cursor(
+            db, status=models.UnitStatus.AVAILABLE, limit=limit, cursor=keyset
+        )
+        return StreamingResponse(
+            _stream_prioritized_units(limit, keyset),
+            media_type="application/x-ndjson",
+            headers={"X-Next-Cursor": next_cursor} if next_cursor else None
+        )
+
     units = crud.get_units(
         db,
         limit=limit,
-        status="available"
+        status="available",
+        cursor=keyset
     )
 
+    if len(units) == limit:
+        response.headers["X-Next-Cursor"] = crud.encode_cursor(units[-1])
+
     # Already sorted by lead_score desc in CRUD function
     return units
 
 
+def _stream_prioritized_units(limit: int, cursor: Optional[Tuple[Optional[float], str]] = None):
+    """
+    Yield available units as NDJSON lines
+    Owns its session: the request's session is closed before streaming starts
+    """
+    db = SessionLocal()
+    try:
+        rows = crud.stream_units(
+            db, status=models.UnitStatus.AVAILABLE, limit=limit, cursor=cursor
+        )
+        for row in rows:
+            yield schemas.UnitResponse.model_validate(row).model_dump_json() + "\n"
+    finally:
+        db.close()
+
+
 @app.post("/api/leads/recalculate", tags=["Lead Scoring"])
-async def recalculate_all_scores(db: Session = Depends(get_db)):
+def recalculate_all_scores(db: Session = Depends(get_db)):
     """
     Recalculate lead scores for all available units
 
@@ -352,14 +433,20 @@ async def recalculate_all_scores(db: Session = Depends(get_db)):
 # ============================================================================
 
 @app.get("/health", tags=["System"])
-async def health_check(db: Session = Depends(get_db)):
+def health_check(db: Session = Depends(get_db)):
     """
     System health check endpoint
     """
     try:
-        # Test database connection
+        # Test database connection, at most once per HEALTH_CHECK_TTL seconds
+        # (failures are not cached, so the next probe retries immediately)
         from sqlalchemy import text
-        db.execute(text("SELECT 1"))
+        cache.cached(
+            "db_health",
+            lambda: db.execute(text("SELECT 1")).scalar(),
+            ttl=HEALTH_CHECK_TTL,
+            versioned=False
+        )
 
         return {
             "status": "healthy",
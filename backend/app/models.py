@@ -3,8 +3,8 @@ SQLAlchemy ORM Models
 Database models for apartment units and related entities
 """
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Enum as SQLEnum
-from sqlalchemy.sql import func
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Index, Enum as SQLEnum
+from sqlalchemy.orm import validates
 from datetime import datetime
 import enum
 from .database import Base
@@ -33,13 +33,15 @@ class Unit(Base):
     unit_number = Column(String, nullable=False)
 
     # Unit Specifications
-    bedrooms = Column(Integer, nullable=False, index=True)
+    # No single-column index: ix_units_bedrooms_status_city leads with bedrooms
+    bedrooms = Column(Integer, nullable=False)
     bathrooms = Column(Float, nullable=False)
     square_feet = Column(Integer, nullable=False)
 
     # Pricing & Status
     price = Column(Integer, nullable=False, index=True)
-    status = Column(SQLEnum(UnitStatus), nullable=False, default=UnitStatus.AVAILABLE, index=True)
+    # No single-column index: the composite indexes below all lead with status
+    status = Column(SQLEnum(UnitStatus), nullable=False, default=UnitStatus.AVAILABLE)
 
     # Features & Amenities (stored as JSON array)
     amenities = Column(JSON, nullable=False, default=list)
@@ -47,6 +49,11 @@ class Unit(Base):
     # Location (stored as JSON object)
     location = Column(JSON, nullable=False)
 
+    # Denormalized from location for indexed filtering/grouping and scoring
+    # (kept in sync by the location validator below)
+    city = Column(String, index=True)
+    zip = Column(String(10), index=True)
+
     # Images (stored as JSON array of URLs)
     images = Column(JSON, nullable=False, default=list)
 
@@ -57,17 +64,37 @@ class Unit(Base):
     lead_score = Column(Float, default=50.0, index=True)
 
     # Timestamps
-    date_listed = Column(DateTime, nullable=False, default=datetime.utcnow)
+    date_listed = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
     date_leased = Column(DateTime, nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Composite indexes for the hot filter/sort paths
+    # (status filter + lead score ordering, status filter + price range,
+    # bedroom/status/city distribution GROUP BY as a covering index scan)
+    __table_args__ = (
+        Index('ix_units_status_lead_score', 'status', lead_score.desc(), id.desc()),
+        Index('ix_units_status_price', 'status', 'price'),
+        Index('ix_units_bedrooms_status_city', 'bedrooms', 'status', 'city'),
+    )
+
+    @validates('location')
+    def _sync_location_fields(self, key, location):
+        """
+        Copy city/zip out of the location JSON whenever it is assigned
+        """
+        if isinstance(location, dict):
+            self.city = location.get('city')
+            self.zip = location.get('zip')
+        return location
+
     def __repr__(self):
         return f"<Unit {self.property_name} - {self.unit_number} ({self.status})>"
 
     def to_dict(self):
         """
         Convert model to dictionary for JSON serialization
+        Datetimes stay datetime objects; orjson writes them as ISO 8601 natively
         """
         return {
             "id": self.id,
@@ -83,8 +110,8 @@ class Unit(Base):
             "images": self.images,
             "description": self.description,
             "lead_score": self.lead_score,
-            "date_listed": self.date_listed.isoformat() if self.date_listed else None,
-            "date_leased": self.date_leased.isoformat() if self.date_leased else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "date_listed": self.date_listed,
+            "date_leased": self.date_leased,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
@@ -61,8 +61,23 @@ class UnitUpdate(BaseModel):
     description: Optional[str] = Field(None, min_length=10, max_length=2000)
 
 
-class UnitResponse(UnitBase):
-    """Schema for unit response"""
+class UnitResponse(BaseModel):
+    """
+    Schema for unit response
+    Plain field types: stored units were validated on write, so responses
+    skip re-checking the UnitBase length/range constraints per row
+    """
+    property_name: str
+    unit_number: str
+    bedrooms: int
+    bathrooms: float
+    square_feet: int
+    price: int
+    status: UnitStatus
+    amenities: List[str]
+    location: Location
+    images: List[str]
+    description: str
     id: str
     lead_score: float
     date_listed: datetime
@@ -80,6 +95,7 @@ class UnitListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class AnalyticsResponse(BaseModel):
@@ -4,12 +4,21 @@ Real-time connection management for instant unit updates
 """
 
 from fastapi import WebSocket
-from typing import List, Dict
-import json
+from typing import List, Dict, Optional
+import asyncio
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Coalescing window for queued updates (seconds)
+# Bursts of mutations within this window go out as a single frame
+BATCH_INTERVAL = 0.05
+
+# Per-connection send queue depth; a slow client drops its oldest messages
+# rather than buffering without bound
+MAX_QUEUED_MESSAGES = 100
+
 
 class ConnectionManager:
     """
@@ -18,31 +27,58 @@ class ConnectionManager:
     """
 
     def __init__(self):
-        # List of active WebSocket connections
-        self.active_connections: List[WebSocket] = []
+        # Active WebSocket connections -> their pending outgoing payloads
+        self.active_connections: Dict[WebSocket, asyncio.Queue] = {}
+
+        # One writer task per connection drains its queue
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+
+        # Messages waiting for the next batched flush
+        self._pending: List[dict] = []
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def connect(self, websocket: WebSocket):
         """
         Accept new WebSocket connection and add to active connections
         """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=MAX_QUEUED_MESSAGES)
+        self.active_connections[websocket] = queue
+        self._writers[websocket] = asyncio.get_running_loop().create_task(
+            self._write_loop(websocket, queue)
+        )
         logger.info(f"Client connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
         """
         Remove WebSocket connection from active connections
         """
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        if self.active_connections.pop(websocket, None) is not None:
+            writer = self._writers.pop(websocket, None)
+            if writer is not None and writer is not asyncio.current_task():
+                writer.cancel()
             logger.info(f"Client disconnected. Total connections: {len(self.active_connections)}")
 
+    async def _write_loop(self, websocket: WebSocket, queue: asyncio.Queue):
+        """
+        Send queued payloads to one client in order
+        A failed send drops the client; other clients are unaffected
+        """
+        while True:
+            payload = await queue.get()
+            try:
+                await websocket.send_text(payload)
+            except Exception as e:
+                logger.error(f"Error broadcasting to client: {e}")
+                self.disconnect(websocket)
+                return
+
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """
         Send message to specific WebSocket connection
         """
         try:
-            await websocket.send_json(message)
+            await websocket.send_text(orjson.dumps(message).decode())
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
 
@@ -54,45 +90,84 @@ class ConnectionManager:
         Args:
             message: Dictionary containing message type and data
         """
-        disconnected = []
+        # Encode once with orjson rather than per connection with stdlib json
+        # Sent as text frames: the browser client JSON.parses event.data
+        payload = orjson.dumps(message).decode()
 
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
-                disconnected.append(connection)
+        # Hand the payload to each connection's writer; never waits on a client
+        for queue in self.active_connections.values():
+            if queue.full():
+                queue.get_nowait()
+                logger.warning("Client send queue full; dropped oldest message")
+            queue.put_nowait(payload)
+
+    def queue_message(self, message: dict):
+        """
+        Queue message for the next batched broadcast
+        Returns immediately; a flush is scheduled BATCH_INTERVAL from the
+        first queued message. Must be called from the event loop.
+
+        Args:
+            message: Dictionary containing message type and data
+        """
+        self._pending.append(message)
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_after_delay())
+
+    async def _flush_after_delay(self):
+        """
+        Wait for the coalescing window, then broadcast everything queued
+        A single message is sent as-is; several go out as one "batch" frame
+        """
+        await asyncio.sleep(BATCH_INTERVAL)
+
+        messages, self._pending = self._pending, []
+        if not messages:
+            return
+
+        if len(messages) == 1:
+            await self.broadcast(messages[0])
+        else:
+            await self.broadcast({"type": "batch", "updates": messages})
+
+    def queue_unit_update(self, unit_data: dict):
+        """
+        Queue unit update for batched broadcast
 
-        # Clean up disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
+        Args:
+            unit_data: Dictionary containing updated unit information
+        """
+        self.queue_message({"type": "unit_update", "data": unit_data})
+
+    def queue_unit_deleted(self, unit_id: str):
+        """
+        Queue unit deletion for batched broadcast
+
+        Args:
+            unit_id: ID of deleted unit
+        """
+        self.queue_message({"type": "unit_deleted", "data": {"id": unit_id}})
 
     async def broadcast_unit_update(self, unit_data: dict):
         """
         Broadcast unit update to all connected clients
-        Specialized method for unit changes
+        Delegates to queue_unit_update, so it goes out with the next batch
 
         Args:
             unit_data: Dictionary containing updated unit information
         """
-        message = {
-            "type": "unit_update",
-            "data": unit_data
-        }
-        await self.broadcast(message)
+        self.queue_unit_update(unit_data)
 
     async def broadcast_unit_deleted(self, unit_id: str):
         """
         Broadcast unit deletion to all connected clients
+        Delegates to queue_unit_deleted, so it goes out with the next batch
 
         Args:
             unit_id: ID of deleted unit
         """
-        message = {
-            "type": "unit_deleted",
-            "data": {"id": unit_id}
-        }
-        await self.broadcast(message)
+        self.queue_unit_deleted(unit_id)
 
     async def broadcast_analytics_update(self, analytics_data: dict):
         """
@@ -4,9 +4,9 @@ Creates realistic apartment unit data for demo purposes
 """
 
 import json
-import random
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
+import numpy as np
 
 # Louisville, KY neighborhoods and properties
 PROPERTIES = [
@@ -45,121 +45,147 @@ AMENITIES_POOL = [
 UNIT_STATUSES = ["available", "pending", "leased"]
 
 
-def generate_random_date(days_ago_min=1, days_ago_max=90):
-    """Generate random past date"""
-    days_ago = random.randint(days_ago_min, days_ago_max)
-    return datetime.utcnow() - timedelta(days=days_ago)
+# Unit specification tables, indexed by bedroom count
+BEDROOM_WEIGHTS = [0.05, 0.30, 0.40, 0.20, 0.05]
+BATHROOM_OPTIONS = [1.0, 1.5, 2.0, 2.5, 3.0]
+BASE_SQFT = np.array([450, 650, 950, 1300, 1800])
+BASE_PRICE = np.array([750, 950, 1350, 1750, 2200])
+BEDROOM_TEXT = ["studio", "1-bedroom", "2-bedroom", "3-bedroom", "4-bedroom"]
+
+# Prime zip codes cost more
+PRIME_ZIPS = ["40202", "40204", "40206", "40207", "40222"]
+
+# Status distribution (60% available, 15% pending, 25% leased)
+STATUS_WEIGHTS = [0.60, 0.15, 0.25]
+
+DESCRIPTION_TEMPLATES = [
+    "Spacious {bedroom_text} apartment in {property_name}. Features include {amenities_3}. Great location near shops and restaurants.",
+    "Modern {bedroom_text} unit with {square_feet} sq ft of living space. Recently updated with new appliances and flooring. Pet-friendly building.",
+    "Charming {bedroom_text} apartment in Louisville's vibrant {property_name} community. Close to public transit and downtown.",
+    "Beautiful {bedroom_text} home with {bathrooms} baths. Enjoy amenities like {amenities_2}. Available immediately.",
+    "Updated {bedroom_text} apartment featuring {amenities_4}. Quiet neighborhood with easy highway access."
+]
 
 
 def generate_unit():
     """Generate a single apartment unit with realistic data"""
+    return generate_seed_data(1)[0]
 
-    # Select property
-    property_name, zip_code = random.choice(PROPERTIES)
 
-    # Unit specifications
-    bedrooms = random.choices([0, 1, 2, 3, 4], weights=[5, 30, 40, 20, 5])[0]
-    bathrooms = random.choice([1.0, 1.5, 2.0, 2.5, 3.0])
+def generate_seed_data(count=100, seed=None):
+    """
+    Generate multiple apartment units
+    Each attribute is drawn for all units at once as a NumPy column;
+    only the final JSON-ready dicts are assembled per unit
+    """
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
 
-    # Square footage based on bedrooms
-    base_sqft = {0: 450, 1: 650, 2: 950, 3: 1300, 4: 1800}[bedrooms]
-    square_feet = base_sqft + random.randint(-100, 200)
+    # Property and unit specifications
+    property_idx = rng.integers(0, len(PROPERTIES), count)
+    property_names = np.array([name for name, _ in PROPERTIES])[property_idx]
+    zip_codes = np.array([zip_code for _, zip_code in PROPERTIES])[property_idx]
 
-    # Price based on bedrooms and location
-    base_price = {0: 750, 1: 950, 2: 1350, 3: 1750, 4: 2200}[bedrooms]
+    bedrooms = rng.choice(len(BEDROOM_WEIGHTS), size=count, p=BEDROOM_WEIGHTS)
+    bathrooms = rng.choice(BATHROOM_OPTIONS, size=count)
 
-    # Prime zip codes cost more
-    prime_zips = ["40202", "40204", "40206", "40207", "40222"]
-    if zip_code in prime_zips:
-        base_price += random.randint(100, 300)
-    else:
-        base_price += random.randint(-100, 100)
+    # Square footage based on bedrooms
+    square_feet = BASE_SQFT[bedrooms] + rng.integers(-100, 201, count)
 
-    price = base_price
+    # Price based on bedrooms and location
+    price = BASE_PRICE[bedrooms] + np.where(
+        np.isin(zip_codes, PRIME_ZIPS),
+        rng.integers(100, 301, count),
+        rng.integers(-100, 101, count)
+    )
 
-    # Status distribution (60% available, 25% leased, 15% pending)
-    status = random.choices(UNIT_STATUSES, weights=[60, 15, 25])[0]
+    statuses = rng.choice(UNIT_STATUSES, size=count, p=STATUS_WEIGHTS)
 
-    # Amenities (3-8 random amenities)
-    num_amenities = random.randint(3, 8)
-    amenities = random.sample(AMENITIES_POOL, num_amenities)
+    # Amenities (3-8 distinct per unit): random permutation of the pool per row
+    amenity_order = np.argsort(rng.random((count, len(AMENITIES_POOL))), axis=1)
+    amenity_counts = rng.integers(3, 9, count)
+    amenities_pool = np.array(AMENITIES_POOL)
 
     # Location
-    street_number = random.randint(100, 9999)
-    street_name = random.choice(STREET_NAMES)
-    location = {
-        "address": f"{street_number} {street_name}",
-        "city": "Louisville",
-        "state": "KY",
-        "zip": zip_code,
-        "lat": round(38.2527 + random.uniform(-0.1, 0.1), 4),
-        "lng": round(-85.7585 + random.uniform(-0.1, 0.1), 4)
-    }
+    street_numbers = rng.integers(100, 10000, count)
+    street_names = np.array(STREET_NAMES)[rng.integers(0, len(STREET_NAMES), count)]
+    lats = np.round(38.2527 + rng.uniform(-0.1, 0.1, count), 4)
+    lngs = np.round(-85.7585 + rng.uniform(-0.1, 0.1, count), 4)
 
     # Images (mock image URLs)
-    image_count = random.randint(3, 8)
-    images = [
-        f"https://picsum.photos/seed/{uuid.uuid4().hex[:8]}/800/600"
-        for _ in range(image_count)
-    ]
-
-    # Description
-    bedroom_text = {
-        0: "studio",
-        1: "1-bedroom",
-        2: "2-bedroom",
-        3: "3-bedroom",
-        4: "4-bedroom"
-    }[bedrooms]
-
-    descriptions = [
-        f"Spacious {bedroom_text} apartment in {property_name}. Features include {', '.join(amenities[:3])}. Great location near shops and restaurants.",
-        f"Modern {bedroom_text} unit with {square_feet} sq ft of living space. Recently updated with new appliances and flooring. Pet-friendly building.",
-        f"Charming {bedroom_text} apartment in Louisville's vibrant {property_name} community. Close to public transit and downtown.",
-        f"Beautiful {bedroom_text} home with {bathrooms} baths. Enjoy amenities like {', '.join(amenities[:2])}. Available immediately.",
-        f"Updated {bedroom_text} apartment featuring {', '.join(amenities[:4])}. Quiet neighborhood with easy highway access."
-    ]
-    description = random.choice(descriptions)
+    image_counts = rng.integers(3, 9, count)
+    image_seeds = rng.integers(0, 2 ** 32, image_counts.sum())
+    image_offsets = np.concatenate(([0], np.cumsum(image_counts)))
 
-    # Dates
-    date_listed = generate_random_date(1, 90)
-    date_leased = None
+    templates = rng.integers(0, len(DESCRIPTION_TEMPLATES), count)
 
-    if status == "leased":
-        # Leased 1-60 days after listing
-        days_to_lease = random.randint(1, 60)
-        date_leased = date_listed + timedelta(days=days_to_lease)
+    # Dates: listed 1-90 days ago, leased 1-60 days after listing
+    date_listed = np.datetime64(now, 'us') - rng.integers(1, 91, count).astype('timedelta64[D]')
+    date_leased = date_listed + rng.integers(1, 61, count).astype('timedelta64[D]')
 
     # Unit number
-    building = random.choice(['A', 'B', 'C', 'D'])
-    floor = random.randint(1, 12)
-    unit_num = random.randint(1, 20)
-    unit_number = f"{building}{floor}{unit_num:02d}"
-
-    return {
-        "id": str(uuid.uuid4()),
-        "property_name": property_name,
-        "unit_number": unit_number,
-        "bedrooms": bedrooms,
-        "bathrooms": bathrooms,
-        "square_feet": square_feet,
-        "price": price,
-        "status": status,
-        "amenities": amenities,
-        "location": location,
-        "images": images,
-        "description": description,
-        "lead_score": 50.0,  # Will be recalculated by backend
-        "date_listed": date_listed.isoformat(),
-        "date_leased": date_leased.isoformat() if date_leased else None,
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat()
-    }
-
-
-def generate_seed_data(count=100):
-    """Generate multiple apartment units"""
-    units = [generate_unit() for _ in range(count)]
+    buildings = np.array(['A', 'B', 'C', 'D'])[rng.integers(0, 4, count)]
+    floors = rng.integers(1, 13, count)
+    unit_nums = rng.integers(1, 21, count)
+
+    # Back to Python scalars once per column (indexing arrays per row is slow)
+    amenity_lists = [
+        amenities_pool[order[:n]].tolist()
+        for order, n in zip(amenity_order, amenity_counts.tolist())
+    ]
+    image_seeds = image_seeds.tolist()
+    image_offsets = image_offsets.tolist()
+    listed = [d.isoformat() for d in date_listed.tolist()]
+    leased = [d.isoformat() for d in date_leased.tolist()]
+    created_at = now.isoformat()
+
+    units = []
+    for i, (property_name, zip_code, beds, baths, sqft, unit_price, status, amenities,
+            street_number, street_name, lat, lng, template, building, floor, unit_num) in enumerate(zip(
+                property_names.tolist(), zip_codes.tolist(), bedrooms.tolist(), bathrooms.tolist(),
+                square_feet.tolist(), price.tolist(), statuses.tolist(), amenity_lists,
+                street_numbers.tolist(), street_names.tolist(), lats.tolist(), lngs.tolist(),
+                templates.tolist(), buildings.tolist(), floors.tolist(), unit_nums.tolist())):
+        description = DESCRIPTION_TEMPLATES[template].format(
+            bedroom_text=BEDROOM_TEXT[beds],
+            property_name=property_name,
+            square_feet=sqft,
+            bathrooms=baths,
+            amenities_2=', '.join(amenities[:2]),
+            amenities_3=', '.join(amenities[:3]),
+            amenities_4=', '.join(amenities[:4])
+        )
+
+        units.append({
+            "id": str(uuid.uuid4()),
+            "property_name": property_name,
+            "unit_number": f"{building}{floor}{unit_num:02d}",
+            "bedrooms": beds,
+            "bathrooms": baths,
+            "square_feet": sqft,
+            "price": unit_price,
+            "status": status,
+            "amenities": amenities,
+            "location": {
+                "address": f"{street_number} {street_name}",
+                "city": "Louisville",
+                "state": "KY",
+                "zip": zip_code,
+                "lat": lat,
+                "lng": lng
+            },
+            "images": [
+                f"https://picsum.photos/seed/{image_seed:08x}/800/600"
+                for image_seed in image_seeds[image_offsets[i]:image_offsets[i + 1]]
+            ],
+            "description": description,
+            "lead_score": 50.0,  # Will be recalculated by backend
+            "date_listed": listed[i],
+            "date_leased": leased[i] if status == "leased" else None,
+            "created_at": created_at,
+            "updated_at": created_at
+        })
+
     return units
 
 
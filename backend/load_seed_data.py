@@ -10,16 +10,17 @@ from pathlib import Path
 # Add app to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.database import engine, Base, SessionLocal
+from app.database import SessionLocal, init_db
 from app.models import Unit, UnitStatus
 from datetime import datetime
+from sqlalchemy import insert
 
 def load_seed_data():
     """Load seed data from JSON file into database"""
 
     # Create all tables
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    init_db()
     print("✅ Tables created")
 
     # Load seed data
@@ -52,7 +53,8 @@ def load_seed_data():
             db.commit()
             print("🗑️  Cleared existing data")
 
-        # Insert seed data
+        # Insert seed data (single executemany INSERT, no per-row ORM unit of work)
+        rows = []
         for unit_data in units_data:
             # Convert ISO date strings to datetime objects
             date_listed = datetime.fromisoformat(unit_data['date_listed'].replace('Z', '+00:00'))
@@ -60,25 +62,29 @@ def load_seed_data():
             if unit_data.get('date_leased'):
                 date_leased = datetime.fromisoformat(unit_data['date_leased'].replace('Z', '+00:00'))
 
-            unit = Unit(
-                id=unit_data['id'],
-                property_name=unit_data['property_name'],
-                unit_number=unit_data['unit_number'],
-                bedrooms=unit_data['bedrooms'],
-                bathrooms=unit_data['bathrooms'],
-                square_feet=unit_data['square_feet'],
-                price=unit_data['price'],
-                status=UnitStatus(unit_data['status']),
-                amenities=unit_data['amenities'],
-                location=unit_data['location'],
-                images=unit_data['images'],
-                description=unit_data['description'],
-                lead_score=unit_data['lead_score'],
-                date_listed=date_listed,
-                date_leased=date_leased
-            )
-            db.add(unit)
-
+            location = unit_data['location']
+            rows.append({
+                "id": unit_data['id'],
+                "property_name": unit_data['property_name'],
+                "unit_number": unit_data['unit_number'],
+                "bedrooms": unit_data['bedrooms'],
+                "bathrooms": unit_data['bathrooms'],
+                "square_feet": unit_data['square_feet'],
+                "price": unit_data['price'],
+                "status": UnitStatus(unit_data['status']),
+                "amenities": unit_data['amenities'],
+                "location": location,
+                # Bulk inserts bypass the location validator; set denormalized columns here
+                "city": location.get('city'),
+                "zip": location.get('zip'),
+                "images": unit_data['images'],
+                "description": unit_data['description'],
+                "lead_score": unit_data['lead_score'],
+                "date_listed": date_listed,
+                "date_leased": date_leased
+            })
+
+        db.execute(insert(Unit), rows)
         db.commit()
 
         # Verify
@@ -0,0 +1,85 @@
+"""
+Shared test fixtures
+One in-memory SQLite database per test session; rows are cleared between tests
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from app import cache, database, models
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """
+    In-memory engine shared by every connection (StaticPool), built once
+    """
+    test_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # Point the app (get_db, streaming responses, init_db) at the test database
+    original_engine = database.engine
+    database.engine = test_engine
+    database.SessionLocal.configure(bind=test_engine)
+    database.init_db()
+
+    yield test_engine
+
+    database.SessionLocal.configure(bind=original_engine)
+    database.engine = original_engine
+    test_engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """
+    Database session on a clean units table with an empty cache
+    """
+    session = database.SessionLocal()
+    yield session
+    session.close()
+
+    with engine.begin() as connection:
+        connection.execute(models.Unit.__table__.delete())
+    cache.bump_units_version()
+    cache.clear()
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    """
+    API client; startup runs init_db against the test database
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def unit_payload():
+    """
+    Valid POST /api/units body
+    """
+    return {
+        "property_name": "Test Apartments",
+        "unit_number": "101",
+        "bedrooms": 2,
+        "bathrooms": 1.0,
+        "square_feet": 900,
+        "price": 1200,
+        "amenities": ["parking", "pool"],
+        "location": {
+            "address": "100 Main St",
+            "city": "Louisville",
+            "state": "KY",
+            "zip": "40202",
+            "lat": 38.25,
+            "lng": -85.76
+        },
+        "description": "Bright two bedroom unit near downtown"
+    }
@@ -0,0 +1,104 @@
+"""
+API tests
+Cursor pagination, ETag revalidation and cache invalidation on writes
+"""
+
+import orjson
+import pytest
+
+
+@pytest.fixture
+def units(client, db, unit_payload):
+    """
+    Five units with distinct prices (and so distinct lead scores)
+    """
+    created = []
+    for index, price in enumerate((900, 1100, 1300, 1500, 1700)):
+        payload = dict(unit_payload, unit_number=str(100 + index), price=price)
+        response = client.post("/api/units", json=payload)
+        assert response.status_code == 201
+        created.append(response.json())
+    return created
+
+
+def test_cursor_pages_match_offset_listing(client, units):
+    expected = [unit["id"] for unit in client.get("/api/units").json()["units"]]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/units", params=params).json()
+        seen += [unit["id"] for unit in page["units"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert len(seen) == len(units)
+
+
+def test_prioritized_cursor_header_round_trip(client, units):
+    first = client.get("/api/leads/prioritized", params={"limit": 3})
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/api/leads/prioritized", params={"limit": 3, "cursor": cursor})
+
+    ids = [unit["id"] for unit in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == len(units)
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_prioritized_ndjson_stream_resumes_from_cursor(client, units):
+    headers = {"Accept": "application/x-ndjson"}
+    json_page = client.get("/api/leads/prioritized", params={"limit": 3})
+
+    first = client.get("/api/leads/prioritized", params={"limit": 3}, headers=headers)
+    assert first.headers["X-Next-Cursor"] == json_page.headers["X-Next-Cursor"]
+
+    second = client.get(
+        "/api/leads/prioritized",
+        params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]},
+        headers=headers
+    )
+    assert "X-Next-Cursor" not in second.headers
+
+    ids = [orjson.loads(line)["id"] for line in (first.text + second.text).splitlines()]
+    assert ids == [unit["id"] for unit in client.get("/api/leads/prioritized").json()]
+
+
+def test_invalid_cursor_rejected(client, db):
+    assert client.get("/api/units", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/units", params={"cursor": "x", "skip": 10}).status_code == 400
+
+
+def test_analytics_etag_revalidation(client, units):
+    first = client.get("/api/analytics")
+    etag = first.headers["ETag"]
+
+    revalidated = client.get("/api/analytics", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    client.patch(f"/api/units/{units[0]['id']}", json={"status": "leased"})
+
+    changed = client.get("/api/analytics", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["leased_units"] == 1
+
+
+def test_cached_reads_invalidated_by_writes(client, units, unit_payload):
+    assert client.get("/api/units").json()["total"] == 5
+    assert client.get("/api/analytics").json()["total_units"] == 5
+
+    created = client.post("/api/units", json=unit_payload).json()
+    assert client.get("/api/units").json()["total"] == 6
+    assert client.get("/api/analytics").json()["total_units"] == 6
+
+    client.delete(f"/api/units/{created['id']}")
+    assert client.get("/api/units").json()["total"] == 5
+    assert client.get("/api/analytics").json()["total_units"] == 5
+
+
+def test_score_breakdown_unknown_unit(client, db):
+    assert client.get("/api/leads/score/missing").status_code == 404
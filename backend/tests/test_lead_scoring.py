@@ -0,0 +1,114 @@
+"""
+Lead scoring tests
+Scalar and vectorized scorers must agree at every threshold edge
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app import lead_scoring
+
+NOW = datetime(2025, 1, 15, 12, 0, 0)
+
+# Market average price 100 makes price_ratio == price / 100 exactly
+MARKET_DATA = {'average_price': 100, 'average_price_per_sqft': 1.0}
+
+
+def make_unit(days_listed: float = 20, **overrides) -> SimpleNamespace:
+    """
+    Unit scoring attributes; the defaults score exactly 50 (no rule fires)
+    """
+    attributes = {
+        'price': 100,
+        'bedrooms': 0,
+        'bathrooms': 1.0,
+        'square_feet': 50,
+        'date_listed': NOW - timedelta(days=days_listed),
+        'amenities': [],
+        'city': None,
+        'zip': None,
+    }
+    attributes.update(overrides)
+    return SimpleNamespace(**attributes)
+
+
+def _around(edges, step):
+    """
+    Each edge plus the values one step below and above it
+    """
+    return sorted({value for edge in edges for value in (edge - step, edge, edge + step)})
+
+
+EDGE_UNITS = (
+    [make_unit(price=price) for price in _around((85, 95, 105, 115), 1)]
+    + [make_unit(price=price) for price in (84.999, 85.001, 105.001, 114.999, 115.001)]
+    + [make_unit(days_listed=days) for days in _around((3, 7, 14, 30, 31, 45, 46), 1)]
+    + [make_unit(days_listed=days - 1e-5) for days in (3, 7, 14, 31, 46)]
+    + [make_unit(bedrooms=bedrooms) for bedrooms in range(6)]
+    + [make_unit(bathrooms=bathrooms) for bathrooms in (0.0, 1.0, 1.4, 1.5, 1.9, 2.0, 2.5)]
+    + [make_unit(price=90, square_feet=square_feet) for square_feet in (99, 100, 101)]
+    + [make_unit(amenities=['parking', 'Washer Dryer', 'pool', 'ac'])]
+    + [make_unit(city='Louisville', zip='40202'), make_unit(zip='40206')]
+)
+
+
+@pytest.mark.parametrize('unit', EDGE_UNITS)
+def test_vectorized_matches_scalar_at_edges(unit):
+    scalar = lead_scoring.calculate_lead_score(unit, MARKET_DATA, NOW)
+    vectorized = lead_scoring.calculate_lead_scores([unit], MARKET_DATA, NOW)[0]
+
+    assert vectorized == scalar
+
+
+def test_vectorized_batch_matches_scalar():
+    scalar = [lead_scoring.calculate_lead_score(unit, MARKET_DATA, NOW) for unit in EDGE_UNITS]
+    vectorized = lead_scoring.calculate_lead_scores(EDGE_UNITS, MARKET_DATA, NOW).tolist()
+
+    assert vectorized == scalar
+
+
+@pytest.mark.parametrize('price, points', [
+    (84, 20), (85, 10), (94, 10), (95, 0),
+    (105, 0), (106, -5), (115, -5), (116, -15),
+])
+def test_price_competitiveness(price, points):
+    unit = make_unit(price=price)
+
+    assert lead_scoring.calculate_lead_score(unit, MARKET_DATA, NOW) == 50 + points
+
+
+@pytest.mark.parametrize('days_listed, points', [
+    (2, 15), (3, 10), (6, 10), (7, 5), (13, 5), (14, 0),
+    (30, 0), (31, -10), (45, -10), (46, -15),
+])
+def test_listing_freshness(days_listed, points):
+    unit = make_unit(days_listed=days_listed)
+
+    assert lead_scoring.calculate_lead_score(unit, MARKET_DATA, NOW) == 50 + points
+
+
+@pytest.mark.parametrize('bedrooms, bathrooms, points', [
+    (0, 1.0, 0), (1, 1.0, 3), (2, 1.0, 7), (3, 1.0, 10), (4, 1.0, 10),
+    (0, 1.5, 3), (0, 2.0, 5),
+])
+def test_unit_size_appeal(bedrooms, bathrooms, points):
+    unit = make_unit(bedrooms=bedrooms, bathrooms=bathrooms)
+
+    assert lead_scoring.calculate_lead_score(unit, MARKET_DATA, NOW) == 50 + points
+
+
+def test_score_is_clamped():
+    unit = make_unit(
+        price=50,
+        days_listed=0,
+        bedrooms=3,
+        bathrooms=2.0,
+        amenities=list(lead_scoring.HIGH_VALUE_AMENITIES),
+        city='Louisville',
+        zip='40202'
+    )
+
+    assert lead_scoring.calculate_lead_score(unit, MARKET_DATA, NOW) == 100.0
+    assert lead_scoring.calculate_lead_scores([unit], MARKET_DATA, NOW)[0] == 100.0
@@ -0,0 +1,67 @@
+"""
+WebSocket manager tests
+Queued messages are coalesced into one frame per batching window
+"""
+
+import asyncio
+
+import orjson
+import pytest
+
+from app.websocket_manager import BATCH_INTERVAL, ConnectionManager
+
+
+class FakeWebSocket:
+    """
+    Records frames sent by the manager
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        self.sent.append(orjson.loads(payload))
+
+
+async def _flush():
+    """
+    Wait out the batching window and let writer tasks drain their queues
+    """
+    await asyncio.sleep(BATCH_INTERVAL * 2)
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_burst_is_sent_as_one_batch_frame():
+    manager = ConnectionManager()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket)
+
+    manager.queue_unit_update({"id": "a", "price": 1200})
+    manager.queue_unit_deleted("b")
+    await _flush()
+
+    assert websocket.sent == [{
+        "type": "batch",
+        "updates": [
+            {"type": "unit_update", "data": {"id": "a", "price": 1200}},
+            {"type": "unit_deleted", "data": {"id": "b"}}
+        ]
+    }]
+    manager.disconnect(websocket)
+
+
+@pytest.mark.asyncio
+async def test_single_message_is_sent_unwrapped():
+    manager = ConnectionManager()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket)
+
+    await manager.broadcast_unit_update({"id": "a"})
+    await _flush()
+
+    assert websocket.sent == [{"type": "unit_update", "data": {"id": "a"}}]
+    manager.disconnect(websocket)
@@ -32,13 +32,19 @@ export function useWebSocket(onUnitUpdate?: (unit: Unit) => void): UseWebSocketR
 
       wsRef.current.onmessage = (event) => {
         try {
-          const message: WebSocketMessage = JSON.parse(event.data);
-          setLastMessage(message);
+          const frame: WebSocketMessage = JSON.parse(event.data);
 
-          if (message.type === 'unit_update' && message.data) {
-            const unit = message.data as Unit;
-            setLastUpdatedUnit(unit);
-            onUnitUpdate?.(unit);
+          // Server coalesces bursts of updates into a single "batch" frame
+          const messages = frame.type === 'batch' && frame.updates ? frame.updates : [frame];
+
+          for (const message of messages) {
+            setLastMessage(message);
+
+            if (message.type === 'unit_update' && message.data) {
+              const unit = message.data as Unit;
+              setLastUpdatedUnit(unit);
+              onUnitUpdate?.(unit);
+            }
           }
         } catch (e) {
           console.error('Failed to parse WebSocket message:', e);
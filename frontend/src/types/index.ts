@@ -34,6 +34,7 @@ export interface UnitListResponse {
   total: number;
   page: number;
   page_size: number;
+  next_cursor: string | null;
 }
 
 export interface UnitFilters {
@@ -75,6 +76,7 @@ export interface DistributionData {
 }
 
 export interface WebSocketMessage {
-  type: 'unit_update' | 'unit_deleted' | 'connected';
-  data: Unit | { unit_id: string } | Record<string, unknown>;
+  type: 'unit_update' | 'unit_deleted' | 'connected' | 'batch';
+  data?: Unit | { unit_id: string } | Record<string, unknown>;
+  updates?: WebSocketMessage[];
 }